@@ -33,29 +33,44 @@ def load_data(input_file: Path) -> Dict[str, List[Dict]]:
         return json.load(f)
 
 
-def remove_outliers_iqr(data: List[float], factor: float = 1.5) -> List[bool]:
+def remove_outliers_iqr(data: List[float], factor: float = 1.5) -> np.ndarray:
     """
     Identify outliers using IQR method.
-    
+
     Args:
         data: List of values
         factor: IQR multiplier (1.5 = standard, 3.0 = very conservative)
-    
+
     Returns:
-        List of booleans indicating which values are NOT outliers (True = keep)
+        Boolean ndarray indicating which values are NOT outliers (True = keep)
     """
     if len(data) < 4:
-        return [True] * len(data)
-    
-    arr = np.array(data)
+        return np.ones(len(data), dtype=bool)
+
+    arr = np.asarray(data)
     q1 = np.percentile(arr, 25)
     q3 = np.percentile(arr, 75)
     iqr = q3 - q1
-    
+
     lower_bound = q1 - factor * iqr
     upper_bound = q3 + factor * iqr
-    
-    return [(lower_bound <= x <= upper_bound) for x in data]
+
+    return (arr >= lower_bound) & (arr <= upper_bound)
+
+
+def _centered_moving_average(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Centered moving average with windows that shrink near the edges,
+    computed in O(n) via the cumulative-sum trick instead of re-summing
+    each window (O(n*window)).
+    """
+    n = x.shape[0]
+    half = window // 2
+    cs = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    idx = np.arange(n)
+    start = np.maximum(0, idx - half)
+    end = np.minimum(n, idx + half + 1)
+    return (cs[end] - cs[start]) / (end - start)
 
 
 def prepare_plot_data(data: Dict[str, List[Dict]], remove_outliers: bool = False) -> Dict[str, tuple]:
@@ -75,27 +90,26 @@ def prepare_plot_data(data: Dict[str, List[Dict]], remove_outliers: bool = False
         if not battles:
             continue
         
-        # Sort battles by timestamp
-        sorted_battles = sorted(battles, key=lambda x: x['battle_timestamp'])
-        
-        # Extract timestamps and decision times
-        timestamps = []
-        avg_times = []
-        
-        for battle in sorted_battles:
-            ts = battle['battle_timestamp']
-            avg_time = battle['avg_decision_time']
-            
-            # Convert unix timestamp to datetime
-            dt = datetime.fromtimestamp(ts)
-            timestamps.append(dt)
-            avg_times.append(avg_time)
-        
+        # Sort battles by timestamp via argsort on a pre-extracted key array,
+        # avoiding a Python lambda + dict lookup per comparison
+        ts_arr = np.fromiter(
+            (b['battle_timestamp'] for b in battles),
+            dtype=np.int64, count=len(battles))
+        order = np.argsort(ts_arr, kind='stable')
+        sorted_battles = [battles[i] for i in order]
+
+        # matplotlib consumes datetime64 directly, so no per-battle
+        # datetime objects are needed
+        timestamps = ts_arr[order].astype('datetime64[s]')
+        avg_times = np.fromiter(
+            (b['avg_decision_time'] for b in sorted_battles),
+            dtype=np.float64, count=len(sorted_battles))
+
         # Remove outliers if requested
         if remove_outliers and len(avg_times) > 3:
             keep_mask = remove_outliers_iqr(avg_times)
-            timestamps = [t for t, keep in zip(timestamps, keep_mask) if keep]
-            avg_times = [v for v, keep in zip(avg_times, keep_mask) if keep]
+            timestamps = timestamps[keep_mask]
+            avg_times = avg_times[keep_mask]
         
         plot_data[username] = (timestamps, avg_times)
     
@@ -123,58 +137,82 @@ def create_plot(
         show_stats: Whether to show statistics in legend
     """
     fig, ax = plt.subplots(figsize=figsize)
-    
+
     # Color palette for different players
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
               '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
-    
+
+    # Precompute per-player styles, stats, and legend labels up front so the
+    # draw loop reuses identical style objects across calls
+    player_colors = {
+        username: colors[idx % len(colors)]
+        for idx, username in enumerate(plot_data)
+    }
+    player_means = {
+        username: float(np.mean(avg_times)) if len(avg_times) else 0
+        for username, (_, avg_times) in plot_data.items()
+    }
+    player_labels = {
+        username: (
+            f"{username} (avg: {player_means[username]:.2f}s, n={len(avg_times)})"
+            if show_stats else username
+        )
+        for username, (_, avg_times) in plot_data.items()
+    }
+
+    # Mean lines are batched into a single hlines collection after the loop
+    # rather than one axhline artist per player
+    mean_ys = []
+    mean_colors = []
+
     # Plot each player's data
-    for idx, (username, (timestamps, avg_times)) in enumerate(plot_data.items()):
-        color = colors[idx % len(colors)]
-        
-        # Calculate statistics
-        avg = sum(avg_times) / len(avg_times) if avg_times else 0
-        min_time = min(avg_times) if avg_times else 0
-        max_time = max(avg_times) if avg_times else 0
-        
-        # Create label with stats if requested
-        if show_stats:
-            label = f"{username} (avg: {avg:.2f}s, n={len(avg_times)})"
-        else:
-            label = username
-        
-        # Plot raw data points
+    for username, (timestamps, avg_times) in plot_data.items():
+        color = player_colors[username]
+        avg = player_means[username]
+        label = player_labels[username]
+
+        # Rasterize large series so per-point vector output doesn't bloat
+        # the saved figure or slow down rendering
+        rasterized = len(avg_times) > 1000
+
+        # Plot raw data points. Markers go into a single scatter collection
+        # with one shared color (one PathCollection) rather than per-point
+        # marker artists from an 'o-' style string
         if moving_average_window > 0:
             # Show raw data as lighter scatter points
-            ax.scatter(timestamps, avg_times, color=color, alpha=0.2, s=15, zorder=1)
-            
+            ax.scatter(timestamps, avg_times, color=color, alpha=0.2, s=15,
+                      zorder=1, rasterized=rasterized)
+
             # Calculate and plot moving average
             if len(avg_times) >= moving_average_window:
-                ma_times = []
-                ma_timestamps = []
-                
-                for i in range(len(avg_times)):
-                    start = max(0, i - moving_average_window // 2)
-                    end = min(len(avg_times), i + moving_average_window // 2 + 1)
-                    window_avg = sum(avg_times[start:end]) / (end - start)
-                    ma_times.append(window_avg)
-                    ma_timestamps.append(timestamps[i])
-                
-                ax.plot(ma_timestamps, ma_times, '-', label=label, color=color, 
+                avg_times_arr = np.asarray(avg_times, dtype=np.float64)
+                ma_times = _centered_moving_average(avg_times_arr, moving_average_window)
+
+                ax.plot(timestamps, ma_times, '-', label=label, color=color,
                        linewidth=2.5, alpha=0.9, zorder=2)
             else:
                 # Not enough data for moving average, plot normally
-                ax.plot(timestamps, avg_times, 'o-', label=label, color=color, 
-                       alpha=0.7, markersize=4, linewidth=1.5)
+                ax.plot(timestamps, avg_times, '-', label=label, color=color,
+                       alpha=0.7, linewidth=1.5)
+                ax.scatter(timestamps, avg_times, color=color, alpha=0.7, s=16,
+                          rasterized=rasterized)
         else:
-            # Plot normal line with markers
-            ax.plot(timestamps, avg_times, 'o-', label=label, color=color, 
-                   alpha=0.7, markersize=4, linewidth=1.5)
+            # Plot normal line plus a single marker collection
+            ax.plot(timestamps, avg_times, '-', label=label, color=color,
+                   alpha=0.7, linewidth=1.5)
+            ax.scatter(timestamps, avg_times, color=color, alpha=0.7, s=16,
+                      rasterized=rasterized)
         
-        # Add a horizontal line for the mean
-        if timestamps and moving_average_window == 0:
-            ax.axhline(y=avg, color=color, linestyle='--', alpha=0.3, linewidth=1)
-    
+        # Queue a horizontal line for the mean
+        if len(timestamps) and moving_average_window == 0:
+            mean_ys.append(avg)
+            mean_colors.append(color)
+
+    if mean_ys:
+        spans = [t for t, _ in plot_data.values() if len(t)]
+        ax.hlines(mean_ys, min(t[0] for t in spans), max(t[-1] for t in spans),
+                 colors=mean_colors, linestyles='--', alpha=0.3, linewidth=1)
+
     # Formatting
     ax.set_xlabel('Battle Date/Time', fontsize=12, fontweight='bold')
     ax.set_ylabel('Average Decision Time (seconds)', fontsize=12, fontweight='bold')
@@ -214,17 +252,17 @@ def create_statistical_summary(data: Dict[str, List[Dict]]) -> str:
         if not battles:
             continue
         
-        avg_times = [b['avg_decision_time'] for b in battles]
+        avg_times = np.asarray([b['avg_decision_time'] for b in battles], dtype=np.float64)
         turns_list = [b['turns'] for b in battles]
         wins = sum(1 for b in battles if b.get('winner', '').lower() == username.lower())
-        
+
         lines.append(f"\nPlayer: {username}")
         lines.append(f"  Total battles (vs PAC-MM* bots): {len(battles)}")
         lines.append(f"  Win rate: {wins}/{len(battles)} ({100*wins/len(battles):.1f}%)")
-        lines.append(f"  Average decision time: {sum(avg_times)/len(avg_times):.2f}s")
-        lines.append(f"  Min decision time: {min(avg_times):.2f}s")
-        lines.append(f"  Max decision time: {max(avg_times):.2f}s")
-        lines.append(f"  Median decision time: {sorted(avg_times)[len(avg_times)//2]:.2f}s")
+        lines.append(f"  Average decision time: {avg_times.mean():.2f}s")
+        lines.append(f"  Min decision time: {avg_times.min():.2f}s")
+        lines.append(f"  Max decision time: {avg_times.max():.2f}s")
+        lines.append(f"  Median decision time: {np.median(avg_times):.2f}s")
         lines.append(f"  Average turns per battle: {sum(turns_list)/len(turns_list):.1f}")
         
         # Time range
@@ -239,11 +277,10 @@ def create_statistical_summary(data: Dict[str, List[Dict]]) -> str:
 
 def create_detailed_plot(
     plot_data: Dict[str, tuple],
-    data: Dict[str, List[Dict]],
     output_prefix: str
 ) -> None:
     """Create multiple detailed plots with different views."""
-    
+
     # 1. Main time series plot
     create_plot(
         plot_data,
@@ -251,18 +288,19 @@ def create_detailed_plot(
         output_file=Path(f"{output_prefix}_timeseries.png"),
         show_stats=True
     )
-    
-    # 2. Distribution plot (histogram)
-    fig, axes = plt.subplots(1, len(data), figsize=(6*len(data), 5))
-    if len(data) == 1:
+
+    # 2. Distribution plot (histogram) - reuses the arrays already
+    # extracted by prepare_plot_data instead of re-scanning the raw data
+    fig, axes = plt.subplots(1, len(plot_data), figsize=(6*len(plot_data), 5))
+    if len(plot_data) == 1:
         axes = [axes]
-    
-    for idx, (username, battles) in enumerate(data.items()):
-        avg_times = [b['avg_decision_time'] for b in battles]
-        
+
+    for idx, (username, (_, avg_times)) in enumerate(plot_data.items()):
+        mean = float(np.mean(avg_times))
+
         axes[idx].hist(avg_times, bins=20, alpha=0.7, edgecolor='black')
-        axes[idx].axvline(sum(avg_times)/len(avg_times), color='red', 
-                         linestyle='--', linewidth=2, label=f'Mean: {sum(avg_times)/len(avg_times):.2f}s')
+        axes[idx].axvline(mean, color='red',
+                         linestyle='--', linewidth=2, label=f'Mean: {mean:.2f}s')
         axes[idx].set_xlabel('Average Decision Time (seconds)', fontweight='bold')
         axes[idx].set_ylabel('Frequency', fontweight='bold')
         axes[idx].set_title(f'{username}\nDecision Time Distribution', fontweight='bold')
@@ -284,11 +322,8 @@ def create_detailed_plot(
         # Calculate moving average (window of 5)
         window = min(5, len(avg_times))
         if window > 1:
-            smoothed = []
-            for i in range(len(avg_times)):
-                start = max(0, i - window // 2)
-                end = min(len(avg_times), i + window // 2 + 1)
-                smoothed.append(sum(avg_times[start:end]) / (end - start))
+            smoothed = _centered_moving_average(
+                np.asarray(avg_times, dtype=np.float64), window)
         else:
             smoothed = avg_times
         
@@ -409,7 +444,7 @@ def main():
         output_prefix = output_path.stem
         output_dir = output_path.parent
         prefix = str(output_dir / output_prefix)
-        create_detailed_plot(plot_data, data, prefix)
+        create_detailed_plot(plot_data, prefix)
     else:
         # Create single plot
         create_plot(plot_data, title=args.title, output_file=output_path, 
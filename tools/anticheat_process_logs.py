@@ -16,34 +16,84 @@ Usage:
     python anticheat_process_logs.py --username <player> --format gen1ou --start 2025-10-01 --end 2025-10-15 --output data.json
 """
 
+import functools
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Tuple, Optional
 import argparse
 
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def _avg_diff(ts):
+        """JIT-compiled kernel: mean of consecutive diffs in (0, 300)."""
+        s = 0
+        n = 0
+        prev = ts[0]
+        for i in range(1, ts.shape[0]):
+            d = ts[i] - prev
+            prev = ts[i]
+            if 0 < d < 300:
+                s += d
+                n += 1
+        return (s / n) if n else np.nan
+except ImportError:
+    numba = None
+    _avg_diff = None
+
+LOG_SUFFIX = '.log.json'
+
 
 def parse_timestamp_from_log_line(line: str) -> Optional[int]:
     """Extract unix timestamp from log line like '|t:|1759276763'"""
     if line.startswith('|t:|'):
         try:
-            return int(line.split('|t:|')[1])
-        except (IndexError, ValueError):
+            # The prefix is fixed-width, so slice past it directly instead
+            # of re-scanning the line with split()
+            return int(line[4:])
+        except ValueError:
             return None
     return None
 
 
-def extract_timestamps_from_log(log: List[str]) -> List[int]:
-    """Extract all timestamps from a battle log."""
-    timestamps = []
+def extract_timestamps_from_log(log: List[str]) -> np.ndarray:
+    """
+    Extract all timestamps from a battle log as an int64 array.
+    A preallocated buffer avoids boxing each timestamp as a Python int,
+    and np.diff consumes the returned view with zero copy.
+    """
+    # Inlined prefix check + slice: one pass, no per-line function call
+    # or intermediate split list
+    buf = np.empty(len(log), dtype=np.int64)
+    k = 0
     for line in log:
-        ts = parse_timestamp_from_log_line(line)
-        if ts is not None:
-            timestamps.append(ts)
-    return timestamps
+        if line.startswith('|t:|'):
+            try:
+                buf[k] = int(line[4:])
+            except ValueError:
+                continue
+            k += 1
+    return buf[:k]
 
 
 def calculate_average_decision_time(timestamps: List[int]) -> Optional[float]:
@@ -53,19 +103,51 @@ def calculate_average_decision_time(timestamps: List[int]) -> Optional[float]:
     """
     if len(timestamps) < 2:
         return None
-    
-    # Calculate time differences between consecutive timestamps
-    differences = []
-    for i in range(1, len(timestamps)):
-        diff = timestamps[i] - timestamps[i-1]
-        # Filter out obviously bad data (negative times, or >5 minutes between turns)
-        if 0 < diff < 300:  # 5 minutes max
-            differences.append(diff)
-    
-    if not differences:
+
+    arr = np.asarray(timestamps, dtype=np.int64)
+
+    if _avg_diff is not None:
+        avg = _avg_diff(arr)
+        return None if np.isnan(avg) else float(avg)
+
+    # Calculate time differences between consecutive timestamps in one
+    # vectorized pass instead of a Python-level loop
+    differences = np.diff(arr)
+    # Filter out obviously bad data (negative times, or >5 minutes between turns)
+    mask = (differences > 0) & (differences < 300)  # 5 minutes max
+
+    if not mask.any():
         return None
-    
-    return sum(differences) / len(differences)
+
+    return float(differences[mask].mean())
+
+
+def scan_log_decision_times(log: List[str]) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Single streaming pass over a battle log: returns (first_timestamp,
+    avg_decision_time) without materializing a timestamp list. The first
+    timestamp serves as the battle_timestamp fallback; the average applies
+    the same (0, 300) sanity filter as calculate_average_decision_time.
+    """
+    first = None
+    prev = None
+    total = 0
+    count = 0
+    for line in log:
+        if line.startswith('|t:|'):
+            try:
+                ts = int(line[4:])
+            except ValueError:
+                continue
+            if prev is not None:
+                diff = ts - prev
+                if 0 < diff < 300:
+                    total += diff
+                    count += 1
+            else:
+                first = ts
+            prev = ts
+    return first, (total / count if count else None)
 
 
 def is_pac_mm_bot(username: str) -> bool:
@@ -73,58 +155,114 @@ def is_pac_mm_bot(username: str) -> bool:
     return username.lower().startswith('pac-mm')
 
 
-def process_battle_log(log_file: Path, target_usernames: List[str]) -> Optional[Dict]:
+def match_target_players(
+    p1: str,
+    p2: str,
+    target_set: frozenset,
+    target_orig: Dict[str, str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Check whether either player is a target username via O(1) set lookup.
+    Returns (target_in_battle, opponent), or (None, None).
+    """
+    p1_lower = p1.lower()
+    if p1_lower in target_set:
+        return target_orig[p1_lower], p2
+    p2_lower = p2.lower()
+    if p2_lower in target_set:
+        return target_orig[p2_lower], p1
+    return None, None
+
+
+def peek_battle_players(f) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Stream just the top-level 'p1'/'p2' values from an open binary file
+    without materializing the rest of the battle JSON (notably 'log').
     """
-    Process a single battle log file.
+    p1 = None
+    p2 = None
+    for key, value in ijson.kvitems(f, ''):
+        if key == 'p1':
+            p1 = value
+        elif key == 'p2':
+            p2 = value
+        if p1 is not None and p2 is not None:
+            break
+    return p1, p2
+
+
+def process_battle_log(
+    log_file: str,
+    battle_id: str,
+    target_set: frozenset,
+    target_orig: Dict[str, str],
+    target_bytes: Tuple[bytes, ...]
+) -> Optional[Dict]:
+    """
+    Process a single battle log file. The battle_id is precomputed from the
+    directory entry name at discovery time, so no per-file path splitting
+    happens here.
     Returns battle data if it matches criteria, None otherwise.
-    
+
+    The target usernames arrive pre-lowercased (target_set for membership,
+    target_orig mapping back to original casing, target_bytes for the raw
+    pre-filter) so no per-file string normalization is needed.
+
     SAFETY: This function only reads log files and never modifies or deletes them.
     All file operations are read-only.
     """
     try:
-        # SAFETY: Open in read-only mode ('r') - cannot modify or delete the file
-        with open(log_file, 'r') as f:
-            data = json.load(f)
-        
-        p1 = data.get('p1', '').lower()
-        p2 = data.get('p2', '').lower()
+        # SAFETY: Open in read-only mode ('rb') - cannot modify or delete the file
+        with open(log_file, 'rb') as f:
+            # Cheap byte-level pre-filter: the p1/p2 fields sit in the first
+            # couple of KB, so a raw substring scan rejects the vast majority
+            # of files without paying for a JSON parse at all
+            head = f.read(2048).lower()
+            if b'pac-mm' not in head or not any(tb in head for tb in target_bytes):
+                return None
+            f.seek(0)
+
+            if ijson is not None:
+                # Stream only p1/p2 first: on the common non-match path this
+                # skips parsing the (potentially long) log array entirely
+                p1, p2 = peek_battle_players(f)
+                if p1 is None or p2 is None:
+                    return None
+
+                target_in_battle, opponent = match_target_players(p1, p2, target_set, target_orig)
+                if not target_in_battle:
+                    return None
+                if not is_pac_mm_bot(opponent):
+                    return None
+
+                # Battle is a keeper - rewind and parse the full object
+                f.seek(0)
+                data = _loads(f.read())
+            else:
+                data = _loads(f.read())
+
+                target_in_battle, opponent = match_target_players(
+                    data.get('p1', ''), data.get('p2', ''), target_set, target_orig)
+                if not target_in_battle:
+                    return None
+                if not is_pac_mm_bot(opponent):
+                    return None
+
         log = data.get('log', [])
-        
-        # Check if any target username is in this battle
-        target_in_battle = None
-        opponent = None
-        
-        for target in target_usernames:
-            target_lower = target.lower()
-            if target_lower == p1:
-                target_in_battle = data['p1']
-                opponent = data['p2']
-                break
-            elif target_lower == p2:
-                target_in_battle = data['p2']
-                opponent = data['p1']
-                break
-        
-        if not target_in_battle:
-            return None
-        
-        # Check if opponent is a PAC-MM* bot
-        if not is_pac_mm_bot(opponent):
-            return None
-        
-        # Extract timestamps and calculate average decision time
-        timestamps = extract_timestamps_from_log(log)
-        avg_time = calculate_average_decision_time(timestamps)
-        
+
+        # Extract timestamps and calculate average decision time in a
+        # single fused pass over the log
+        first_ts, avg_time = scan_log_decision_times(log)
+
         if avg_time is None:
             return None
-        
+
         # Get battle start time
         battle_timestamp = data.get('timestamp')
         if not battle_timestamp:
             # Try to use first timestamp from log
-            if timestamps:
-                battle_timestamp = timestamps[0]
+            if first_ts is not None:
+                battle_timestamp = first_ts
             else:
                 return None
         else:
@@ -134,8 +272,8 @@ def process_battle_log(log_file: Path, target_usernames: List[str]) -> Optional[
                     dt = datetime.strptime(battle_timestamp, '%a %b %d %Y %H:%M:%S GMT%z (Coordinated Universal Time)')
                     battle_timestamp = int(dt.timestamp())
                 except:
-                    if timestamps:
-                        battle_timestamp = timestamps[0]
+                    if first_ts is not None:
+                        battle_timestamp = first_ts
                     else:
                         return None
         
@@ -149,8 +287,8 @@ def process_battle_log(log_file: Path, target_usernames: List[str]) -> Optional[
             'battle_timestamp': battle_timestamp,
             'turns': turns,
             'winner': winner,
-            'battle_id': log_file.stem,
-            'log_file': str(log_file)
+            'battle_id': battle_id,
+            'log_file': log_file
         }
         
     except Exception as e:
@@ -182,50 +320,96 @@ def process_logs(
     target_usernames: List[str],
     start_date: str,
     end_date: str,
-    verbose: bool = False
+    verbose: bool = False,
+    max_workers: Optional[int] = None
 ) -> Dict[str, List[Dict]]:
     """
     Process all battle logs for target usernames in the given date range.
-    
+
+    Per-file work (JSON parse + timestamp math) is independent, so files are
+    farmed out to a process pool for a near-linear speedup with CPU count.
+
     Returns:
         Dictionary mapping username -> list of battle data
     """
     results = defaultdict(list)
-    total_processed = 0
     total_matched = 0
-    
-    # Iterate through date range
-    # Structure: logs/YYYY-MM/format/YYYY-MM-DD/
+
+    # Normalize target usernames once instead of per file
+    target_set = frozenset(t.lower() for t in target_usernames)
+    target_orig = {t.lower(): t for t in target_usernames}
+    target_bytes = tuple(t.encode('utf-8') for t in target_set)
+
+    # Group requested dates by month so each format directory is listed
+    # once with scandir instead of issuing an exists() stat per day
+    dates_by_month = defaultdict(list)
     for year_month, date_str in date_range_iterator(start_date, end_date):
-        date_dir = logs_dir / year_month / format_id / date_str
-        
-        if not date_dir.exists():
+        dates_by_month[year_month].append(date_str)
+
+    # Collect all log files across the date range, with battle ids sliced
+    # from the entry names up front (no per-file Path.stem/splitext later)
+    # Structure: logs/YYYY-MM/format/YYYY-MM-DD/
+    all_files = []
+    all_battle_ids = []
+    for year_month, date_strs in dates_by_month.items():
+        format_dir = logs_dir / year_month / format_id
+
+        try:
+            with os.scandir(format_dir) as entries:
+                existing_dates = {
+                    entry.name for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                }
+        except FileNotFoundError:
             if verbose:
-                print(f"Directory not found: {date_dir}")
+                print(f"Directory not found: {format_dir}")
             continue
-        
-        # Process all log files in this date directory
-        log_files = list(date_dir.glob('*.log.json'))
-        
-        if verbose:
-            print(f"Processing {len(log_files)} files from {date_str}...")
-        
-        for log_file in log_files:
-            total_processed += 1
-            battle_data = process_battle_log(log_file, target_usernames)
-            
+
+        for date_str in date_strs:
+            if date_str not in existing_dates:
+                if verbose:
+                    print(f"Directory not found: {format_dir / date_str}")
+                continue
+
+            date_dir = format_dir / date_str
+
+            # os.scandir + endswith is noticeably faster than Path.glob for
+            # directories with many thousands of entries, and avoids a Path
+            # object allocation per file
+            found = 0
+            for entry in os.scandir(date_dir):
+                name = entry.name
+                if name.endswith(LOG_SUFFIX) and entry.is_file(follow_symlinks=False):
+                    all_files.append(os.path.join(date_dir, name))
+                    all_battle_ids.append(name[:-len(LOG_SUFFIX)])
+                    found += 1
+
+            if verbose:
+                print(f"Found {found} files from {date_str}...")
+
+    total_processed = len(all_files)
+
+    # Process files in parallel; chunksize keeps IPC overhead amortized
+    process_one = functools.partial(
+        process_battle_log,
+        target_set=target_set,
+        target_orig=target_orig,
+        target_bytes=target_bytes
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for battle_data in executor.map(process_one, all_files, all_battle_ids, chunksize=64):
             if battle_data:
                 results[battle_data['username']].append(battle_data)
                 total_matched += 1
-                
+
                 # Show first few matches as sanity check
                 if verbose and total_matched <= 3:
                     print(f"  ✓ Match #{total_matched}: {battle_data['username']} vs {battle_data['opponent']}")
                     print(f"    Battle: {battle_data['battle_id']}, Avg time: {battle_data['avg_decision_time']:.2f}s, Turns: {battle_data['turns']}")
-                
+
                 if verbose and total_matched % 10 == 0 and total_matched > 3:
                     print(f"  Found {total_matched} matching battles so far...")
-    
+
     if verbose:
         print(f"\nProcessing complete:")
         print(f"  Total files processed: {total_processed}")
@@ -287,6 +471,12 @@ def main():
         action='store_true',
         help='Verbose output'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: CPU count)'
+    )
     
     args = parser.parse_args()
     
@@ -315,7 +505,8 @@ def main():
         target_usernames=args.username,
         start_date=args.start,
         end_date=args.end,
-        verbose=args.verbose
+        verbose=args.verbose,
+        max_workers=args.workers
     )
     
     # Save results
@@ -330,9 +521,22 @@ def main():
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Write output file (this is the ONLY write operation in this script)
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    # Write output file (this is the ONLY write operation in this script).
+    # Users are serialized one list at a time, so peak memory is bounded by
+    # the largest single user's battle list rather than the full result set
+    with open(output_path, 'wb') as f:
+        f.write(b'{\n')
+        for i, (username, battles) in enumerate(results.items()):
+            if i:
+                f.write(b',\n')
+            if orjson is not None:
+                key = orjson.dumps(username)
+                chunk = orjson.dumps(battles, option=orjson.OPT_INDENT_2)
+            else:
+                key = json.dumps(username).encode('utf-8')
+                chunk = json.dumps(battles, indent=2).encode('utf-8')
+            f.write(b'  ' + key + b': ' + chunk)
+        f.write(b'\n}\n')
     
     print(f"\nResults saved to: {output_path}")
     print(f"Total users analyzed: {len(results)}")